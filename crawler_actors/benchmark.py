@@ -2,7 +2,10 @@ import dataclasses
 import json
 import os
 import re
+import tempfile
+from abc import ABC, abstractmethod
 from datetime import datetime
+from enum import StrEnum
 
 import typer
 import asyncio
@@ -19,6 +22,8 @@ from actor_benchmarks.actor_benchmark import (
     set_logging_config,
     APIFY_TOKEN_ENV_VARIABLE_NAME,
 )
+from actor_benchmarks.local_run import LocalActorRun, run_actor_locally
+from actor_benchmarks.test_server import SiteTopology, start_test_server
 
 
 @dataclasses.dataclass(kw_only=True)
@@ -69,6 +74,33 @@ class CrawlerPerformanceBenchmark(ActorBenchmark):
             total_cost_usd=run_data.get("usageTotalUsd", 0.0),
         )
 
+    @classmethod
+    @override
+    def from_local_run(
+        cls,
+        run: LocalActorRun,
+        actor_name: str,
+        *,
+        actor_lock_file: str = "",
+        benchmark_version: str = "1",
+        custom_fields: dict[str, str] | None = None,
+    ) -> Self:
+        meta_data = ActorBenchmarkMetadata.from_local_run(
+            run=run,
+            actor_name=actor_name,
+            actor_lock_file=actor_lock_file,
+            benchmark_version=benchmark_version,
+            custom_fields=custom_fields,
+        )
+        results = {(item["title"], item["url"]) for item in run.iterate_dataset_items()}
+
+        # Local runs have no container start overhead and no platform costs.
+        return cls(
+            meta_data=meta_data,
+            valid_result_count=len(results),
+            runtime=run.runtime_secs,
+        )
+
     def __str__(self) -> str:
         return (
             f"Actor: {self.meta_data.actor_name}, "
@@ -119,56 +151,243 @@ class CrawlerPerformanceBenchmark(ActorBenchmark):
         return 0.0
 
 
+class RunBackend(ABC):
+    """Environment in which the benchmarked actors are built and run."""
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        return None
+
+    @abstractmethod
+    async def prepare_actor(self, actor_dir: pathlib.Path) -> str:
+        """Build the actor from its directory and return the actor identifier used by the other methods."""
+
+    @abstractmethod
+    async def run_actor(
+        self, actor_id: str, run_input: dict | None, memory_mbytes: int
+    ) -> tuple[str, str]:
+        """Run the actor once, wait for it to finish and return the run id and the final run status."""
+
+    @abstractmethod
+    async def benchmark_run(
+        self, run_id: str, lock_file: str = ""
+    ) -> CrawlerPerformanceBenchmark:
+        """Create benchmark from the finished run."""
+
+    async def save_benchmark(
+        self, benchmark: CrawlerPerformanceBenchmark, tag: str = ""
+    ) -> None:
+        """Persist the aggregated benchmark."""
+        kvs_link = await benchmark.save_to_kvs(tag=tag)
+        await benchmark.save_metrics_to_dataset(tag=tag, kvs_details_link=kvs_link)
+
+    async def cleanup_actor(self, actor_id: str) -> None:
+        """Release resources created for the actor by `prepare_actor`."""
+        return None
+
+
+class PlatformBackend(RunBackend):
+    """Build actors with `apify push` and run them on the Apify platform."""
+
+    def __init__(self) -> None:
+        self._client = ApifyClientAsync(token=os.getenv(APIFY_TOKEN_ENV_VARIABLE_NAME))
+        self._user_name = ""
+
+    @override
+    async def __aenter__(self) -> Self:
+        subprocess.run(
+            ["apify", "login", "-t", os.environ[APIFY_TOKEN_ENV_VARIABLE_NAME]],
+            capture_output=True,
+            check=True,
+        )
+        user = await self._client.user().get()
+        if user is None:
+            raise RuntimeError("Missing user data")
+        self._user_name = user["username"]
+        return self
+
+    @override
+    async def prepare_actor(self, actor_dir: pathlib.Path) -> str:
+        actor_name = f"{self._user_name}~{_read_actor_name(actor_dir)}"
+        logger.info(f"Building actor: {actor_name}")
+        subprocess.run(
+            ["apify", "push", "--force"],
+            capture_output=True,
+            check=True,
+            cwd=actor_dir,
+        )
+        return actor_name
+
+    @override
+    async def run_actor(
+        self, actor_id: str, run_input: dict | None, memory_mbytes: int
+    ) -> tuple[str, str]:
+        started_run_data = await self._client.actor(actor_id).start(
+            run_input=run_input, memory_mbytes=memory_mbytes
+        )
+        finished_run_data = await self._client.run(
+            started_run_data["id"]
+        ).wait_for_finish()
+
+        if finished_run_data is None:
+            raise RuntimeError("Missing run data")
+
+        # Check migrationCount once available. finished_run_data["stats"]["migrationCount"]>0
+        return finished_run_data["id"], finished_run_data["status"]
+
+    @override
+    async def benchmark_run(
+        self, run_id: str, lock_file: str = ""
+    ) -> CrawlerPerformanceBenchmark:
+        return await CrawlerPerformanceBenchmark.from_actor_run(
+            run_id=run_id, actor_lock_file=lock_file
+        )
+
+    @override
+    async def cleanup_actor(self, actor_id: str) -> None:
+        # Delete the actor once it is no longer necessary.
+        await self._client.actor(actor_id).delete()
+
+
+class LocalBackend(RunBackend):
+    """Run actors directly from their source directories as local processes against a local test server.
+
+    Actor dependencies are expected to be installed by `uv` (Python actors) or `npm` (JavaScript actors).
+    """
+
+    def __init__(
+        self,
+        storage_root: pathlib.Path | None = None,
+        site_topology: SiteTopology | None = None,
+    ) -> None:
+        self._storage_root = storage_root
+        self._site_topology = site_topology
+        self._temporary_storage_root: tempfile.TemporaryDirectory | None = None
+        self._test_server: subprocess.Popen | None = None
+        self._runs: dict[str, LocalActorRun] = {}
+        self._actor_dirs: dict[str, pathlib.Path] = {}
+
+    @override
+    async def __aenter__(self) -> Self:
+        if self._storage_root is None:
+            self._temporary_storage_root = tempfile.TemporaryDirectory(
+                prefix="actor-benchmarks-"
+            )
+            self._storage_root = pathlib.Path(self._temporary_storage_root.name)
+        self._test_server = start_test_server(self._site_topology)
+        return self
+
+    @override
+    async def __aexit__(self, *exc_info: object) -> None:
+        if self._test_server is not None:
+            self._test_server.terminate()
+            self._test_server.wait()
+        if self._temporary_storage_root is not None:
+            self._temporary_storage_root.cleanup()
+
+    @override
+    async def prepare_actor(self, actor_dir: pathlib.Path) -> str:
+        actor_name = _read_actor_name(actor_dir)
+        logger.info(f"Installing dependencies of actor: {actor_name}")
+        if (actor_dir / "package.json").exists():
+            subprocess.run(
+                ["npm", "install"], capture_output=True, check=True, cwd=actor_dir
+            )
+        elif (actor_dir / "pyproject.toml").exists():
+            subprocess.run(
+                ["uv", "sync"], capture_output=True, check=True, cwd=actor_dir
+            )
+        self._actor_dirs[actor_name] = actor_dir
+        return actor_name
+
+    @override
+    async def run_actor(
+        self, actor_id: str, run_input: dict | None, memory_mbytes: int
+    ) -> tuple[str, str]:
+        if self._storage_root is None:
+            raise RuntimeError("Backend must be entered before running actors.")
+        run = await run_actor_locally(
+            actor_dir=self._actor_dirs[actor_id],
+            storage_root=self._storage_root,
+            run_input=run_input,
+            memory_mbytes=memory_mbytes,
+        )
+        self._runs[run.id] = run
+        return run.id, run.status
+
+    @override
+    async def benchmark_run(
+        self, run_id: str, lock_file: str = ""
+    ) -> CrawlerPerformanceBenchmark:
+        run = self._runs[run_id]
+        return CrawlerPerformanceBenchmark.from_local_run(
+            run=run,
+            actor_name=_read_actor_name(run.actor_dir),
+            actor_lock_file=lock_file,
+        )
+
+    @override
+    async def save_benchmark(
+        self, benchmark: CrawlerPerformanceBenchmark, tag: str = ""
+    ) -> None:
+        if not os.getenv(APIFY_TOKEN_ENV_VARIABLE_NAME):
+            logger.info("No Apify token available. Local benchmark is not saved.")
+            return
+        await super().save_benchmark(benchmark, tag=tag)
+
+
+class Backend(StrEnum):
+    PLATFORM = "platform"
+    LOCAL = "local"
+
+
+def _create_backend(
+    backend: Backend, site_topology: SiteTopology | None = None
+) -> RunBackend:
+    if backend == Backend.LOCAL:
+        return LocalBackend(site_topology=site_topology)
+    return PlatformBackend()
+
+
 async def _get_valid_run_ids(
-    actor_name: str,
+    backend: RunBackend,
+    actor_id: str,
     run_samples: int,
     memory_mbytes: int,
     run_input: dict | None = None,
 ) -> list[str]:
     """Get run ids of actor runs by running the actor several times and keeping only the valid runs."""
-    client = ApifyClientAsync(token=os.getenv(APIFY_TOKEN_ENV_VARIABLE_NAME))
-    actor_client = client.actor(actor_name)
-
     valid_run_ids = list[str]()
     run_count = 0
     while len(valid_run_ids) < run_samples:
         # Run in sequence to not stress the test site
         run_count += 1
-        logger.info(f"Starting actor: {actor_name}. Run: {run_count}")
-        started_run_data = await actor_client.start(
-            run_input=run_input, memory_mbytes=memory_mbytes
+        logger.info(f"Starting actor: {actor_id}. Run: {run_count}")
+        run_id, status = await backend.run_actor(
+            actor_id=actor_id, run_input=run_input, memory_mbytes=memory_mbytes
         )
-        actor_run = client.run(started_run_data["id"])
-        finished_run_data = await actor_run.wait_for_finish()
-
-        if finished_run_data is None:
-            raise RuntimeError("Missing run data")
 
-        # Check migrationCount once available. finished_run_data["stats"]["migrationCount"]>0
-        # if finished_run_data["stats"]["migrationCount"]>0 or finished_run_data['status'] != 'SUCCEEDED':
-        if finished_run_data["status"] != "SUCCEEDED":
+        if status != "SUCCEEDED":
             # Actor failed or migration occurred during run. Run is not suitable for a benchmark.
             logger.info("Actor run not suitable for benchmark.")
-            logger.info(
-                f"Actor run status: {finished_run_data['status']}, migration count: {0}"
-            )
+            logger.info(f"Actor run status: {status}, migration count: {0}")
             continue
 
         logger.info("Actor run successfully finished.")
-        valid_run_ids.append(finished_run_data["id"])
+        valid_run_ids.append(run_id)
 
     return valid_run_ids
 
 
 async def _benchmark_runs(
-    run_ids: list[str], lock_file: str = ""
+    backend: RunBackend, run_ids: list[str], lock_file: str = ""
 ) -> CrawlerPerformanceBenchmark:
     """Benchmark existing actor runs."""
     benchmarks = []
     for run_id in run_ids:
-        benchmark = await CrawlerPerformanceBenchmark.from_actor_run(
-            run_id=run_id, actor_lock_file=lock_file
-        )
+        benchmark = await backend.benchmark_run(run_id=run_id, lock_file=lock_file)
         logger.info(f"Benchmark of run {run_id}, {benchmark=!s}")
         benchmarks.append(benchmark)
 
@@ -179,12 +398,30 @@ async def _benchmark_runs(
     return aggregated_benchmark
 
 
+def _get_actor_dirs(actor_name_pattern: str) -> list[pathlib.Path]:
+    """Get directories of all crawler actors in the directory containing this file that match the pattern."""
+    return [
+        actor_dir
+        for actor_dir in sorted(pathlib.Path(__file__).parent.iterdir())
+        if (actor_dir / ".actor" / "actor.json").exists()
+        and re.findall(actor_name_pattern, str(actor_dir))
+    ]
+
+
+def _read_actor_name(actor_dir: pathlib.Path) -> str:
+    with open(actor_dir / ".actor" / "actor.json") as f:
+        actor_name: str = json.load(f)["name"]
+    return actor_name
+
+
 async def benchmark_actors(
     actor_name_pattern: str,
     actor_input_json: str | None = None,
     tag: str = "",
     repetitions: int = 5,
     regenerate_lock_files: bool = False,
+    backend: Backend = Backend.PLATFORM,
+    site_topology: SiteTopology | None = None,
 ) -> None:
     """Benchmark pre created actor in this folder.
 
@@ -194,65 +431,41 @@ async def benchmark_actors(
         tag: Tag used to classify the benchmark purpose.
         repetitions: The number of repetitions of each actor run.
         regenerate_lock_files: Will force regenerate lock files in the actor directories.
+        backend: Where the actors are built and run.
+        site_topology: Shape of the site served by the local test server. Used only by the local backend.
     """
 
     set_logging_config()
 
-    subprocess.run(
-        ["apify", "login", "-t", os.environ[APIFY_TOKEN_ENV_VARIABLE_NAME]],
-        capture_output=True,
-        check=True,
-    )
-
-    client = ApifyClientAsync(token=os.getenv(APIFY_TOKEN_ENV_VARIABLE_NAME))
-
-    user = await client.user().get()
-
-    if user is not None:
-        user_name = user["username"]
-    else:
-        raise RuntimeError("Missing user data")
-
-    # Run and benchmark all crawler actors found in the directory containing this file.
-    crawler_dirs = [d for d in pathlib.Path(__file__).parent.iterdir() if d.is_dir()]
-    for actor_dir in crawler_dirs:
-        if not re.findall(actor_name_pattern, str(actor_dir)):
-            continue
-        with open(actor_dir / ".actor" / "actor.json") as f:
-            actor_name = f"{user_name}~{json.load(f)['name']}"
-            logger.info(f"{actor_name=}")
-
-        if regenerate_lock_files:
-            logger.info(f"Regenerating lock file for actor: {actor_name}")
-            _regenerate_lock_files(actor_dir)
-
-        logger.info(f"Building actor: {actor_name}")
-        subprocess.run(
-            ["apify", "push", "--force"],
-            capture_output=True,
-            check=True,
-            cwd=actor_dir,
-        )
-
-        # Run actors n times. Run in sequence to not stress the test site.
-        try:
-            valid_runs = await _get_valid_run_ids(
-                actor_name=actor_name,
-                run_samples=repetitions,
-                memory_mbytes=8192,
-                run_input=json.loads(actor_input_json) if actor_input_json else None,
-            )
-
-            benchmark = await _benchmark_runs(
-                valid_runs, lock_file=_read_version_file(actor_dir)
-            )
-
-            kvs_link = await benchmark.save_to_kvs(tag=tag)
-            await benchmark.save_metrics_to_dataset(tag=tag, kvs_details_link=kvs_link)
-
-        finally:
-            # Delete the actor once it is no longer necessary.
-            await client.actor(actor_name).delete()
+    async with _create_backend(backend, site_topology) as run_backend:
+        # Run and benchmark all crawler actors found in the directory containing this file.
+        for actor_dir in _get_actor_dirs(actor_name_pattern):
+            if regenerate_lock_files:
+                logger.info(f"Regenerating lock file for actor: {actor_dir.name}")
+                _regenerate_lock_files(actor_dir)
+
+            actor_id = await run_backend.prepare_actor(actor_dir)
+            logger.info(f"{actor_id=}")
+
+            # Run actors n times. Run in sequence to not stress the test site.
+            try:
+                valid_runs = await _get_valid_run_ids(
+                    backend=run_backend,
+                    actor_id=actor_id,
+                    run_samples=repetitions,
+                    memory_mbytes=8192,
+                    run_input=json.loads(actor_input_json)
+                    if actor_input_json
+                    else None,
+                )
+
+                benchmark = await _benchmark_runs(
+                    run_backend, valid_runs, lock_file=_read_version_file(actor_dir)
+                )
+                await run_backend.save_benchmark(benchmark, tag=tag)
+
+            finally:
+                await run_backend.cleanup_actor(actor_id)
 
 
 def _read_version_file(directory: pathlib.Path) -> str:
@@ -286,6 +499,14 @@ def run(
     tag: str = typer.Argument(default=""),
     repetitions: int = typer.Argument(default=5),
     regenerate_lock_files: bool = typer.Argument(default=False),
+    backend: Backend = typer.Option(
+        default=Backend.PLATFORM,
+        help="Run actors on the Apify platform or locally from their source directories.",
+    ),
+    site_topology_json: str | None = typer.Option(
+        default=None,
+        help="JSON with `SiteTopology` fields of the site served by the local test server.",
+    ),
 ) -> None:
     asyncio.run(
         benchmark_actors(
@@ -294,6 +515,10 @@ def run(
             tag=tag,
             repetitions=repetitions,
             regenerate_lock_files=regenerate_lock_files,
+            backend=backend,
+            site_topology=SiteTopology(**json.loads(site_topology_json))
+            if site_topology_json
+            else None,
         )
     )
 
@@ -8,6 +8,8 @@ from typing import Self
 
 from apify_client import ApifyClientAsync
 
+from actor_benchmarks.local_run import LocalActorRun
+
 logger = logging.getLogger("benchmark_logger")
 
 APIFY_TOKEN_ENV_VARIABLE_NAME = "APIFY_API_TOKEN"
@@ -71,6 +73,24 @@ class ActorBenchmarkMetadata:
             custom_fields=custom_fields or {},
         )
 
+    @classmethod
+    def from_local_run(
+        cls,
+        run: LocalActorRun,
+        actor_name: str,
+        actor_lock_file: str = "",
+        benchmark_version: str = "",
+        custom_fields: dict[str, str] | None = None,
+    ) -> Self:
+        return cls(
+            actor_name=actor_name,
+            actor_inputs=run.run_input,
+            run_options={"backend": "local", "command": run.command},
+            actor_lock_file=actor_lock_file,
+            benchmark_version=benchmark_version,
+            custom_fields=custom_fields or {},
+        )
+
 
 @dataclass(kw_only=True)
 class ActorBenchmark:
@@ -105,6 +125,37 @@ class ActorBenchmark:
         )
         return cls(meta_data=meta_data)
 
+    @classmethod
+    def from_local_run(
+        cls,
+        run: LocalActorRun,
+        actor_name: str,
+        *,
+        actor_lock_file: str = "",
+        benchmark_version: str = "1",
+        custom_fields: dict[str, str] | None = None,
+    ) -> Self:
+        """Generate benchmark from finished local actor run.
+
+        Args:
+            run: Local actor run used to generate benchmark.
+            actor_name: Name of the benchmarked actor.
+            actor_lock_file: Additional detailed information about actor version dependencies.
+            benchmark_version: Version of the benchmark.
+            custom_fields: Custom data that can be appended to the benchmark.
+
+        Returns:
+            Benchmark created from local actor run.
+        """
+        meta_data = ActorBenchmarkMetadata.from_local_run(
+            run=run,
+            actor_name=actor_name,
+            actor_lock_file=actor_lock_file,
+            benchmark_version=benchmark_version,
+            custom_fields=custom_fields,
+        )
+        return cls(meta_data=meta_data)
+
     @classmethod
     def aggregate_results(cls, actor_benchmarks: list[Self]) -> Self:
         """Aggregate multiple benchmarks into one.
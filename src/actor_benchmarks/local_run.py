@@ -0,0 +1,167 @@
+import asyncio
+import json
+import logging
+import os
+import pathlib
+import socket
+import subprocess
+import time
+import uuid
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+logger = logging.getLogger("benchmark_logger")
+
+_DEFAULT_STORAGE_NAME = "default"
+_METADATA_FILE_SUFFIX = "__metadata__.json"
+
+
+@dataclass(kw_only=True)
+class LocalActorRun:
+    """Actor run executed as a local process with its own local storage directory."""
+
+    id: str
+    actor_dir: pathlib.Path
+    storage_dir: pathlib.Path
+    run_input: dict
+    command: list[str]
+    started_at: datetime
+    runtime_secs: float
+    exit_code: int
+
+    @property
+    def status(self) -> str:
+        """Run status using the same values as the Apify platform runs."""
+        return "SUCCEEDED" if self.exit_code == 0 else "FAILED"
+
+    @property
+    def log_path(self) -> pathlib.Path:
+        """Path to the file with combined stdout and stderr of the run."""
+        return self.storage_dir / "run.log"
+
+    def iterate_dataset_items(
+        self, dataset_name: str = _DEFAULT_STORAGE_NAME
+    ) -> Iterator[dict]:
+        """Iterate over items of the local dataset in the order in which they were pushed."""
+        dataset_dir = self.storage_dir / "datasets" / dataset_name
+        if not dataset_dir.exists():
+            return
+        for item_path in sorted(dataset_dir.glob("*.json")):
+            if item_path.name.endswith(_METADATA_FILE_SUFFIX):
+                continue
+            with open(item_path) as f:
+                item = json.load(f)
+            # Items pushed in one batch may be stored as a list in a single file.
+            if isinstance(item, list):
+                yield from item
+            else:
+                yield item
+
+    def get_record(self, key: str, store_name: str = _DEFAULT_STORAGE_NAME) -> Any:
+        """Get value of the record from the local key-value store or None if the record does not exist."""
+        store_dir = self.storage_dir / "key_value_stores" / store_name
+        candidates = [store_dir / f"{key}.json", *sorted(store_dir.glob(f"{key}.*"))]
+        for record_path in candidates:
+            if not record_path.is_file() or record_path.name.endswith(
+                _METADATA_FILE_SUFFIX
+            ):
+                continue
+            if record_path.suffix == ".json":
+                with open(record_path) as f:
+                    return json.load(f)
+            return record_path.read_bytes()
+        return None
+
+
+def get_actor_command(actor_dir: pathlib.Path) -> list[str]:
+    """Get command that starts the actor from its source directory."""
+    if (actor_dir / "package.json").exists():
+        return ["npm", "start", "--silent"]
+    if (actor_dir / "pyproject.toml").exists():
+        for package_dir in sorted(actor_dir.iterdir()):
+            if (package_dir / "__main__.py").exists():
+                return ["uv", "run", "python", "-m", package_dir.name]
+    raise ValueError(f"Unable to determine how to start actor in {actor_dir}.")
+
+
+async def run_actor_locally(
+    actor_dir: pathlib.Path,
+    storage_root: pathlib.Path,
+    run_input: dict | None = None,
+    memory_mbytes: int | None = None,
+    env: dict[str, str] | None = None,
+) -> LocalActorRun:
+    """Run actor from its source directory as a local process and wait for it to finish.
+
+    Args:
+        actor_dir: Directory with the actor source code.
+        storage_root: Directory in which the run specific storage directory is created.
+        run_input: Actor input stored as the `INPUT` record of the default key-value store.
+        memory_mbytes: Memory limit reported to the actor. Crawlee uses it to scale the concurrency.
+        env: Additional environment variables for the actor process.
+
+    Returns:
+        Finished local actor run.
+    """
+    run_id = uuid.uuid4().hex
+    storage_dir = storage_root / run_id
+    input_dir = storage_dir / "key_value_stores" / _DEFAULT_STORAGE_NAME
+    input_dir.mkdir(parents=True)
+    with open(input_dir / "INPUT.json", "w") as f:
+        json.dump(run_input or {}, f)
+
+    run_env = {
+        **os.environ,
+        "APIFY_LOCAL_STORAGE_DIR": str(storage_dir),
+        "CRAWLEE_STORAGE_DIR": str(storage_dir),
+        "APIFY_HEADLESS": "1",
+        **(env or {}),
+    }
+    if memory_mbytes:
+        run_env["ACTOR_MEMORY_MBYTES"] = str(memory_mbytes)
+
+    command = get_actor_command(actor_dir)
+    logger.info(f"Starting local run {run_id} of {actor_dir.name}: {command}")
+    started_at = datetime.now()
+    start = time.perf_counter()
+    with open(storage_dir / "run.log", "wb") as log_file:
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            cwd=actor_dir,
+            env=run_env,
+            stdout=log_file,
+            stderr=asyncio.subprocess.STDOUT,
+        )
+        exit_code = await process.wait()
+    runtime_secs = time.perf_counter() - start
+
+    return LocalActorRun(
+        id=run_id,
+        actor_dir=actor_dir,
+        storage_dir=storage_dir,
+        run_input=run_input or {},
+        command=command,
+        started_at=started_at,
+        runtime_secs=runtime_secs,
+        exit_code=exit_code,
+    )
+
+
+def start_local_server(
+    command: list[str], port: int, host: str = "127.0.0.1", timeout_secs: float = 30
+) -> subprocess.Popen:
+    """Start a server in a subprocess and wait until it accepts connections on the port."""
+    server = subprocess.Popen(command, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + timeout_secs
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return server
+        except OSError:
+            if server.poll() is not None:
+                break
+            time.sleep(0.1)
+    server.terminate()
+    raise RuntimeError(f"Server {command} did not start.")
@@ -0,0 +1,279 @@
+"""High-throughput target site for crawler benchmarks.
+
+The site is a tree of generated pages. Page paths are made of one character per tree level, for example `/`, `/0`,
+`/01`, `/012`. Every page is fully determined by its path and the `SiteTopology`, so the same site can be served
+repeatedly and the expected crawl results can be computed without running the server.
+"""
+
+import functools
+import json
+import os
+import random
+import subprocess
+import sys
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, fields
+from typing import Any
+
+import typer
+import uvicorn
+
+from actor_benchmarks.local_run import start_local_server
+
+Scope = dict[str, Any]
+Receive = Callable[[], Awaitable[dict[str, Any]]]
+Send = Callable[[dict[str, Any]], Awaitable[None]]
+
+_PATH_ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+_REDIRECT_PREFIX = "/redirect"
+_TOPOLOGY_ENV_VARIABLE_NAME = "BENCHMARK_SITE_TOPOLOGY"
+_FILLER_TEXT = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. "
+_RESPONSE_CACHE_SIZE = 2**16
+
+
+@dataclass(frozen=True, kw_only=True)
+class SiteTopology:
+    """Shape of the generated benchmark site.
+
+    The defaults produce the same binary tree as `benchmark_server_js/test_server.js`.
+    """
+
+    fan_out: int = 2
+    """Number of child pages linked from each page."""
+
+    depth: int = 32
+    """Number of tree levels below the root page. Pages on the last level have no child links."""
+
+    page_size: int = 0
+    """Minimal size of the page in bytes. Pages are padded with filler text up to this size."""
+
+    duplicate_links: int = 0
+    """How many times are links to the child pages repeated on the page."""
+
+    cross_links: int = 0
+    """Number of additional links to random pages anywhere in the site."""
+
+    cyclic_links: bool = False
+    """Whether each page links back to its parent and to the root page."""
+
+    redirect_ratio: float = 0.0
+    """Fraction of links that point to a URL redirecting to the linked page."""
+
+    seed: int = 0
+    """Seed of the random generator used for cross links and redirects."""
+
+    def __post_init__(self) -> None:
+        if not 1 <= self.fan_out <= len(_PATH_ALPHABET):
+            raise ValueError(f"fan_out must be between 1 and {len(_PATH_ALPHABET)}.")
+        if not 0.0 <= self.redirect_ratio <= 1.0:
+            raise ValueError("redirect_ratio must be between 0 and 1.")
+
+    def is_page(self, path: str) -> bool:
+        """Check whether the path belongs to a page of the site."""
+        node = path[1:]
+        return (
+            path.startswith("/")
+            and len(node) <= self.depth
+            and all(char in _PATH_ALPHABET[: self.fan_out] for char in node)
+        )
+
+    def child_pages(self, path: str) -> list[str]:
+        """Get paths of the child pages of the page."""
+        if len(path) - 1 >= self.depth:
+            return []
+        return [f"{path}{char}" for char in _PATH_ALPHABET[: self.fan_out]]
+
+    def linked_pages(self, path: str) -> list[str]:
+        """Get paths of all pages linked from the page, including duplicates, in the order of the links on the page.
+
+        Redirecting links are resolved to the page they redirect to.
+        """
+        rng = self._page_random(path)
+        children = self.child_pages(path)
+        linked = children * (self.duplicate_links + 1)
+        if self.cyclic_links and path != "/":
+            linked.extend([path[:-1] or "/", "/"])
+        for _ in range(self.cross_links):
+            length = rng.randint(0, self.depth)
+            linked.append(
+                "/"
+                + "".join(
+                    rng.choice(_PATH_ALPHABET[: self.fan_out]) for _ in range(length)
+                )
+            )
+        return linked
+
+    def links(self, path: str) -> list[str]:
+        """Get hrefs of all links on the page."""
+        rng = self._page_random(f"{path}#redirects")
+        return [
+            f"{_REDIRECT_PREFIX}{linked}"
+            if rng.random() < self.redirect_ratio
+            else linked
+            for linked in self.linked_pages(path)
+        ]
+
+    def render_page(self, path: str) -> bytes:
+        """Render the HTML of the page."""
+        links = "\n        ".join(
+            f'<a href="{href}">{href}</a>' for href in self.links(path)
+        )
+        page = f"""
+<html>
+    <head>
+        <title>{path}</title>
+    </head>
+    <body>
+        {links}
+        <p>{{filler}}</p>
+    </body>
+</html>"""
+        filler_size = max(0, self.page_size - len(page) + len("{filler}"))
+        filler = (_FILLER_TEXT * (filler_size // len(_FILLER_TEXT) + 1))[:filler_size]
+        return page.replace("{filler}", filler).encode()
+
+    def _page_random(self, path: str) -> random.Random:
+        # String seeds are hashed deterministically, unlike `hash()` of a string.
+        return random.Random(f"{self.seed}:{path}")
+
+
+class TestServerApp:
+    """ASGI application serving the generated site."""
+
+    def __init__(self, topology: SiteTopology) -> None:
+        self._topology = topology
+        self._get_response = functools.lru_cache(maxsize=_RESPONSE_CACHE_SIZE)(
+            self._create_response
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "lifespan":
+            while True:
+                message = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        if scope["type"] != "http":
+            return
+
+        status, headers, body = self._get_response(scope["path"])
+        await send(
+            {"type": "http.response.start", "status": status, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    def _create_response(
+        self, path: str
+    ) -> tuple[int, list[tuple[bytes, bytes]], bytes]:
+        if path.startswith(f"{_REDIRECT_PREFIX}/"):
+            target = path.removeprefix(_REDIRECT_PREFIX)
+            if self._topology.is_page(target):
+                return (
+                    301,
+                    [(b"location", target.encode()), (b"content-length", b"0")],
+                    b"",
+                )
+
+        if not self._topology.is_page(path):
+            return 404, [(b"content-length", b"0")], b""
+
+        body = self._topology.render_page(path)
+        headers = [
+            (b"content-type", b"text/html; charset=utf-8"),
+            (b"content-length", str(len(body)).encode()),
+        ]
+        return 200, headers, body
+
+
+def create_app_from_env() -> TestServerApp:
+    """Create the application from the topology stored in the environment. Used by the uvicorn worker processes."""
+    topology = json.loads(os.environ.get(_TOPOLOGY_ENV_VARIABLE_NAME, "{}"))
+    return TestServerApp(SiteTopology(**topology))
+
+
+def start_test_server(
+    topology: SiteTopology | None = None, port: int = 8080, workers: int = 1
+) -> subprocess.Popen:
+    """Start the test server in a subprocess and wait until it accepts connections."""
+    topology_args = [
+        arg
+        for topology_field in fields(SiteTopology)
+        for arg in _to_cli_option(
+            topology_field.name,
+            getattr(topology or SiteTopology(), topology_field.name),
+        )
+    ]
+    return start_local_server(
+        [
+            sys.executable,
+            "-m",
+            "actor_benchmarks.test_server",
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            *topology_args,
+        ],
+        port=port,
+    )
+
+
+def _to_cli_option(name: str, value: object) -> list[str]:
+    option = f"--{name.replace('_', '-')}"
+    if isinstance(value, bool):
+        return [option] if value else []
+    return [option, str(value)]
+
+
+test_server_cli = typer.Typer()
+
+
+@test_server_cli.command()
+def serve(
+    host: str = typer.Option(default="127.0.0.1"),
+    port: int = typer.Option(default=8080),
+    workers: int = typer.Option(default=1, help="Number of server processes."),
+    fan_out: int = typer.Option(default=2),
+    depth: int = typer.Option(default=32),
+    page_size: int = typer.Option(default=0),
+    duplicate_links: int = typer.Option(default=0),
+    cross_links: int = typer.Option(default=0),
+    cyclic_links: bool = typer.Option(default=False),
+    redirect_ratio: float = typer.Option(default=0.0),
+    seed: int = typer.Option(default=0),
+) -> None:
+    """Serve the generated benchmark site."""
+    topology = SiteTopology(
+        fan_out=fan_out,
+        depth=depth,
+        page_size=page_size,
+        duplicate_links=duplicate_links,
+        cross_links=cross_links,
+        cyclic_links=cyclic_links,
+        redirect_ratio=redirect_ratio,
+        seed=seed,
+    )
+    server_options: dict[str, Any] = {
+        "host": host,
+        "port": port,
+        "log_level": "warning",
+        "access_log": False,
+    }
+    if workers > 1:
+        # Worker processes can't receive the application object, so they create it from the environment.
+        os.environ[_TOPOLOGY_ENV_VARIABLE_NAME] = json.dumps(asdict(topology))
+        uvicorn.run(
+            "actor_benchmarks.test_server:create_app_from_env",
+            factory=True,
+            workers=workers,
+            **server_options,
+        )
+    else:
+        uvicorn.run(TestServerApp(topology), **server_options)
+
+
+if __name__ == "__main__":
+    test_server_cli()